@@ -35,6 +35,7 @@ setup(
         "Programming Language :: Python :: 3.10",
     ],
     install_requires=requirements,
+    extras_require={"orjson": ["orjson"]},
     include_package_data=True,
     packages=find_packages(include=["slack_cleaner2"]),
     setup_requires=setup_requirements,
@@ -2,10 +2,17 @@
 """
  logger util module
 """
+import atexit
+from collections import deque
 from datetime import datetime
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 import sys
-from typing import Union, Optional
+from threading import Lock
+from time import monotonic
+from typing import Deque, Dict, List, Optional, Tuple
+from weakref import WeakSet
 
 from colorama import Fore, init  # type: ignore
 
@@ -13,27 +20,49 @@ from colorama import Fore, init  # type: ignore
 # init colors for Powershell
 init()
 
+# precomputed progress markers
+_OK_GLYPH = "."
+_ERR_GLYPH = Fore.RED + "x" + Fore.RESET
+
 
 class SlackLoggerLayer:
     """
     one stack element to group delete operations
     """
 
-    def __init__(self, name: str, parent: Union["SlackLogger", "SlackLoggerLayer"]):
-        self.deleted = 0
-        self.errors = 0
+    def __init__(self, name: str, parent: "SlackLogger"):
         self.name = name
         self._parent = parent
+        # snapshots of the running totals of the logger, the counts are the difference
+        self._start = parent.totals()
+        self._end: Optional[Tuple[int, int]] = None
+
+    def _current(self) -> Tuple[int, int]:
+        return self._end if self._end is not None else self._parent.totals()
+
+    @property
+    def deleted(self) -> int:
+        """
+        number of deleted entries within this group
+        """
+        return self._current()[0] - self._start[0]
+
+    @property
+    def errors(self) -> int:
+        """
+        number of errors within this group
+        """
+        return self._current()[1] - self._start[1]
+
+    def close(self):
+        """
+        freezes the counts of this group
+        """
+        self._end = self._parent.totals()
 
     def __str__(self):
         return f"{self.name}: deleted: {self.deleted}, errors: {self.errors}"
 
-    def __call__(self, error=False):
-        if error:
-            self.errors += 1
-        else:
-            self.deleted += 1
-
     def __enter__(self):
         return self
 
@@ -42,21 +71,56 @@ class SlackLoggerLayer:
         return self._parent
 
 
+# background listeners writing the log entries by logger name
+_LISTENERS: Dict[str, QueueListener] = {}
+
+
+def _stop_listeners():
+    while _LISTENERS:
+        _, listener = _LISTENERS.popitem()
+        listener.stop()
+
+
+atexit.register(_stop_listeners)
+
+# loggers whose buffered progress markers are written at exit
+_PROGRESS_LOGGERS: "WeakSet[SlackLogger]" = WeakSet()
+
+
+def _flush_all_progress():
+    for logger in list(_PROGRESS_LOGGERS):
+        logger.flush_progress()
+
+
+atexit.register(_flush_all_progress)
+
+
 def _create_default_logger(to_file=False):
     log = logging.getLogger("slack-cleaner")
     for handler in list(log.handlers):
         log.removeHandler(handler)
+    if log.name in _LISTENERS:
+        _LISTENERS.pop(log.name).stop()
+
+    handlers: List[logging.Handler] = []
     if to_file:
         ts = datetime.now().strftime("%Y%m%d-%H%M%S")
         file_log_handler = logging.FileHandler("slack-cleaner." + ts + ".log")
         file_log_handler.setLevel(logging.DEBUG)
-        log.addHandler(file_log_handler)
+        handlers.append(file_log_handler)
 
     log.setLevel(logging.DEBUG)
     # And always display on console
     out = logging.StreamHandler()
     out.setLevel(logging.DEBUG)
-    log.addHandler(out)
+    handlers.append(out)
+
+    # write the log entries in a background thread to keep I/O out of the delete loop
+    queue: SimpleQueue = SimpleQueue()
+    log.addHandler(QueueHandler(queue))
+    listener = QueueListener(queue, *handlers, respect_handler_level=True)
+    _LISTENERS[log.name] = listener
+    listener.start()
     return log
 
 
@@ -67,8 +131,14 @@ class SlackLogger:
 
     def __init__(self, to_file=False, logger: Optional[logging.Logger] = None, show_progress=True):
         self.show_progress = show_progress
-        self._layers = [SlackLoggerLayer("overall", self)]
+        self._lock = Lock()
+        self._progress_buf: List[str] = []
+        self._last_flush = monotonic()
+        self._deleted_total = 0
+        self._errors_total = 0
+        self._layers: Deque[SlackLoggerLayer] = deque([SlackLoggerLayer("overall", self)])
         self._log = logger if logger else _create_default_logger(to_file)
+        _PROGRESS_LOGGERS.add(self)
 
         # wrap regular log methods
         self.debug = self._log.debug
@@ -83,23 +153,47 @@ class SlackLogger:
         """
         log a deleted file or message with optional error
         """
-        for layer in self._layers:
-            layer(error)
+        with self._lock:
+            if error:
+                self._errors_total += 1
+            else:
+                self._deleted_total += 1
 
-        if not self.show_progress:
-            return
+            if not self.show_progress:
+                return
 
-        if error:
-            sys.stdout.write(Fore.RED + "x" + Fore.RESET)
-        else:
-            sys.stdout.write(".")
+            self._progress_buf.append(_ERR_GLYPH if error else _OK_GLYPH)
+            if len(self._progress_buf) >= 64 or monotonic() - self._last_flush > 0.25:
+                self._flush_progress()
+
+    def totals(self) -> Tuple[int, int]:
+        """
+        overall number of deleted entries and errors
+        """
+        return self._deleted_total, self._errors_total
+
+    def _flush_progress(self):
+        self._last_flush = monotonic()
+        if not self._progress_buf:
+            return
+        # write through sys.stdout such that colorama can strip or convert the colors
+        sys.stdout.write("".join(self._progress_buf))
         sys.stdout.flush()
+        self._progress_buf.clear()
+
+    def flush_progress(self):
+        """
+        writes pending progress markers to the console
+        """
+        with self._lock:
+            self._flush_progress()
 
     def group(self, name: str) -> SlackLoggerLayer:
         """
         push another log group
         """
         layer = SlackLoggerLayer(name, self)
+        self.flush_progress()
         self.info("start deleting: %s", name)
         self._layers.append(layer)
         return layer
@@ -108,8 +202,9 @@ class SlackLogger:
         """
         pops last log group
         """
-        layer = self._layers[-1]
-        del self._layers[-1]
+        layer = self._layers.pop()
+        layer.close()
+        self.flush_progress()
         self.info("stop deleting: %s", layer)
         return layer
 
@@ -120,4 +215,5 @@ class SlackLogger:
         """
         logs ones summary
         """
+        self.flush_progress()
         self.info("summary %s", self)
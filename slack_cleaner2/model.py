@@ -2,21 +2,42 @@
 """
  model module for abstracting channels, messages, and files
 """
-from typing import Any, Callable, cast, Dict, Generic, Iterator, Iterable, List, Optional, Sequence, TypeVar, Union
+from typing import Any, Callable, cast, Deque, Dict, FrozenSet, Generic, Iterator, Iterable, List, Optional, Sequence, Set, Tuple, TypeVar, Union
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import glob
+import hashlib
+import json
+import os
 import time
 from os import path
+import tempfile
+import random
+import re
+import shutil
 from enum import Enum
 from logging import Logger
+from queue import Full, Queue
+from threading import Event, Lock, Thread
 from time import sleep
-from functools import cached_property
+from functools import cached_property, lru_cache
 from datetime import datetime
-import requests
-from requests import Response
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry import RetryHandler
+from slack_sdk.http_retry.builtin_handlers import ConnectionErrorRetryHandler, ServerErrorRetryHandler
+from slack_sdk.http_retry.builtin_interval_calculators import BackoffRetryIntervalCalculator
+
+try:
+    from orjson import loads as json_loads  # type: ignore
+except ImportError:
+    from json import loads as json_loads  # type: ignore
 
 from .logger import SlackLogger
+from .util import TokenBucket
 
 JSONDict = Dict[str, Any]
 TimeIsh = Union[None, int, str, float]
@@ -27,6 +48,8 @@ class SlackUser:
     internal model of a slack user
     """
 
+    __slots__ = ("id", "name", "real_name", "display_name", "email", "is_bot", "is_app_user", "json", "_slack", "__dict__")
+
     id: str
     """
     user id
@@ -52,21 +75,16 @@ class SlackUser:
     user email address
     """
 
-    is_bot = False
+    is_bot: bool
     """
     is it a bot user
     """
 
-    is_app_user = False
+    is_app_user: bool
     """
     is it an app user
     """
 
-    bot = False
-    """
-    is it a bot or app user
-    """
-
     json: JSONDict
     """
     the underlying slack response as json
@@ -82,13 +100,20 @@ class SlackUser:
         self.id = entry["id"]
         self._slack = slack
         self.name = entry["name"]
-        self.real_name = entry["profile"].get("real_name")
-        self.display_name = entry["profile"]["display_name"]
-        self.email = entry["profile"].get("email")
+        profile = entry["profile"]
+        self.real_name = profile.get("real_name")
+        self.display_name = profile["display_name"]
+        self.email = profile.get("email")
         self.json = entry
-        self.is_bot = entry["is_bot"]
-        self.is_app_user = entry["is_app_user"]
-        self.bot = self.is_bot or self.is_app_user
+        self.is_bot = entry.get("is_bot", False)
+        self.is_app_user = entry.get("is_app_user", False)
+
+    @property
+    def bot(self) -> bool:
+        """
+        is it a bot or app user
+        """
+        return self.is_bot or self.is_app_user
 
     def __str__(self):
         return f"{self.name} ({self.id}) {self.real_name}"
@@ -111,7 +136,14 @@ class SlackUser:
         """
         return SlackFile.list(self._slack, user=self.id, after=after, before=before, types=types)
 
-    def msgs(self, after: TimeIsh = None, before: TimeIsh = None, with_replies=False) -> Iterator["SlackMessage"]:
+    @cached_property
+    def channels(self) -> List["SlackChannel"]:
+        """
+        list of conversations this user is a member of
+        """
+        return self._slack.channels_by_user.get(self.id, [])
+
+    def msgs(self, after: TimeIsh = None, before: TimeIsh = None, with_replies=False, workers=1) -> Iterator["SlackMessage"]:
         """
         list all messages of this user
 
@@ -120,11 +152,14 @@ class SlackUser:
         :param before: limit to entries before the given timestamp
         :type before: int,str,time
         :type with_replies: boolean
+        :param workers: number of channels fetched concurrently
+        :type workers: int
         :return: generator of SlackMessage objects
         :rtype: SlackMessage
         """
-        for msg in self._slack.msgs((c for c in self._slack.conversations if self in c.members), after=after, before=before, with_replies=with_replies):
-            if msg.user == self:
+        for msg in self._slack.msgs(self.channels, after=after, before=before, with_replies=with_replies, workers=workers):
+            # compare the raw ids to not resolve the author of every message
+            if msg.user_id == self.id:
                 yield msg
 
     def reactions(self) -> Iterator[Dict]:
@@ -145,11 +180,22 @@ class SlackChannelType(Enum):
     IM = 4
 
 
+# history scope needed to read messages of the given channel type
+_HISTORY_SCOPES = {
+    SlackChannelType.PUBLIC: "channels:history",
+    SlackChannelType.PRIVATE: "groups:history",
+    SlackChannelType.MPIM: "mpim:history",
+    SlackChannelType.IM: "im:history",
+}
+
+
 class SlackChannel:
     """
     internal model of a slack channel, group, mpim, im
     """
 
+    __slots__ = ("id", "type", "json", "_slack", "__dict__")
+
     id: str
     """
     channel id
@@ -187,16 +233,36 @@ class SlackChannel:
         """
         return self.json.get("name", self.id)
 
+    @cached_property
+    def _member_id_list(self) -> List[str]:
+        if self.is_archived:
+            self._slack.log.debug("cannot fetch members of archived channel %s", self.name)
+            return []
+        return list(self._slack.safe_paginated_api(lambda kw: self._slack.client.conversations_members(channel=self.id, **kw), "members", None, "conversations.members"))
+
     @cached_property
     def members(self) -> List[SlackUser]:
         """
         list of members
         """
-        if self.is_archived:
-            self._slack.log.debug("cannot fetch members of archived channel %s", self.name)
-            return []
-        raw_members = self._slack.safe_paginated_api(lambda kw: self._slack.client.conversations_members(channel=self.id, **kw), "members")
-        return [self._slack.users.resolve_user(user) for user in raw_members]
+        return list(map(self._slack.users.resolve_user, self._member_id_list))
+
+    @cached_property
+    def member_ids(self) -> FrozenSet[str]:
+        """
+        set of member ids, does not need to resolve the users
+        """
+        return frozenset(self._member_id_list)
+
+    def has_member(self, user: Union[SlackUser, str]) -> bool:
+        """
+        checks whether the given user or user id is a member of this channel
+
+        :param user: user or user id to check
+        :type user: SlackUser,str
+        :rtype: bool
+        """
+        return (user.id if isinstance(user, SlackUser) else user) in self.member_ids
 
     @property
     def is_archived(self) -> bool:
@@ -212,13 +278,7 @@ class SlackChannel:
         return str(self)
 
     def _scope(self):
-        if self.type == SlackChannelType.PRIVATE:
-            return "groups:history"
-        if self.type == SlackChannelType.MPIM:
-            return "mpim:history"
-        if self.type == SlackChannelType.IM:
-            return "im:history"
-        return "channels:history"
+        return _HISTORY_SCOPES.get(self.type, "channels:history")
 
     def msgs(self, after: TimeIsh = None, before: TimeIsh = None, asc=False, with_replies=False) -> Iterator["SlackMessage"]:
         """
@@ -243,14 +303,29 @@ class SlackChannel:
             lambda kw: self._slack.client.conversations_history(channel=self.id, latest=before_time, oldest=after_time, **kw), "messages", [self._scope()], "conversations.history"
         )
 
+        # replies broadcast to the channel are part of both the history and the thread, only those need to be remembered
+        seen_broadcasts: Set[str] = set()
+
+        def is_seen_broadcast(entry: JSONDict) -> bool:
+            if entry.get("subtype") != "thread_broadcast":
+                return False
+            if entry["ts"] in seen_broadcasts:
+                return True
+            seen_broadcasts.add(entry["ts"])
+            return False
+
         for msg in reversed(list(messages)) if asc else messages:
             # Delete user messages
-            if msg["type"] == "message":
+            if msg.get("type") == "message":
+                if with_replies and is_seen_broadcast(msg):
+                    continue
                 s_msg = SlackMessage(msg, self, self._slack)
                 yield s_msg
 
                 if with_replies and s_msg.has_replies:
-                    yield from self.replies_to(s_msg, after=after, before=before, asc=asc)
+                    for reply in self.replies_to(s_msg, after=after, before=before, asc=asc):
+                        if not is_seen_broadcast(reply.json):
+                            yield reply
 
     def replies_to(self, base_msg: "SlackMessage", after: TimeIsh = None, before: TimeIsh = None, asc=False) -> Iterator["SlackMessage"]:
         """
@@ -278,11 +353,49 @@ class SlackChannel:
 
         for msg in reversed(list(messages)) if asc else messages:
             # Delete user messages
-            if msg["type"] == "message":
+            if msg.get("type") == "message":
                 s_msg = SlackMessage(msg, self, self._slack)
                 if base_msg.ts != s_msg.ts:  # don't yield itself
                     yield s_msg
 
+    def replies_to_many(self, base_msgs: Iterable["SlackMessage"], after: TimeIsh = None, before: TimeIsh = None, asc=False, workers=4) -> Iterator[Tuple["SlackMessage", List["SlackMessage"]]]:
+        """
+        returns the replies to the given SlackMessage instances fetching multiple threads concurrently
+
+        :param base_msgs: message instances to find replies to
+        :type base_msgs: iterable of SlackMessage
+        :param after: limit to entries after the given timestamp
+        :type after: int,str,time
+        :param before: limit to entries before the given timestamp
+        :type before: int,str,time
+        :param asc: returning a batch of messages in ascending order
+        :type asc: boolean
+        :param workers: number of threads fetched concurrently
+        :type workers: int
+        :return: generator of base message and its replies in the order of the given messages
+        :rtype: (SlackMessage, [SlackMessage])
+        """
+
+        def fetch(base_msg: SlackMessage) -> List[SlackMessage]:
+            if not base_msg.has_replies:
+                return []
+            return list(self.replies_to(base_msg, after=after, before=before, asc=asc))
+
+        pending: Deque[Tuple[SlackMessage, Future]] = deque()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            try:
+                for base_msg in base_msgs:
+                    pending.append((base_msg, executor.submit(fetch, base_msg)))
+                    if len(pending) >= 2 * workers:
+                        done_msg, future = pending.popleft()
+                        yield done_msg, future.result()
+                while pending:
+                    done_msg, future = pending.popleft()
+                    yield done_msg, future.result()
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
     def files(self, after: TimeIsh = None, before: TimeIsh = None, types: Optional[str] = None) -> Iterator["SlackFile"]:
         """
         list all files of this channel
@@ -304,6 +417,8 @@ class SlackDirectMessage(SlackChannel):
     internal model of a slack direct message channel
     """
 
+    __slots__ = ()
+
     def __init__(self, entry: JSONDict, slack: "SlackCleaner"):
         """
         :param entry: json dict entry as returned by slack api
@@ -328,6 +443,10 @@ class SlackDirectMessage(SlackChannel):
         """
         return self._slack.users.resolve_user(self.json["user"])
 
+    @cached_property
+    def _member_id_list(self) -> List[str]:
+        return [self.json["user"]]
+
     @cached_property
     def members(self) -> List[SlackUser]:
         """
@@ -341,22 +460,22 @@ class SlackMessage:
     internal model of a slack message
     """
 
-    ts: float
+    # messages are created in large numbers, __dict__ is only needed for the cached properties
+    __slots__ = ("ts", "thread_ts", "text", "user_id", "pinned_to", "json", "has_replies", "is_tombstone", "channel", "_slack", "__dict__")
+
+    delete_scope = "chat:write"
     """
-    message timestamp
+    scope needed to delete a message
     """
-    dt: datetime
+
+    ts: float
     """
-    message timestamp as datetime
+    message timestamp
     """
     thread_ts: Optional[float]
     """
     message timestamp for its thread
     """
-    thread_dt: Optional[datetime]
-    """
-    message timestamp for its thread as datetime
-    """
 
     text: str
     """
@@ -368,12 +487,7 @@ class SlackMessage:
     user id writing the message
     """
 
-    bot = False
-    """
-    is the message written by a bot
-    """
-
-    pinned_to = False
+    pinned_to: bool
     """
     is the message pinned
     """
@@ -383,15 +497,11 @@ class SlackMessage:
     the underlying slack response as json
     """
 
-    has_replies = False
+    has_replies: bool
     """
     whether the message has any replies
     """
-    files: List["SlackFile"] = []
-    """
-    files part of this message
-    """
-    is_tombstone = False
+    is_tombstone: bool
     """
     whether the is a tombstone message as in 'message was deleted'
     thus cannot be deleted but is thread can
@@ -412,20 +522,51 @@ class SlackMessage:
         :type slack: SlackCleaner
         """
         self.ts = float(entry["ts"])
-        self.dt = datetime.fromtimestamp(self.ts)
         self.text = entry["text"]
         self.channel = channel
         self._slack = slack
         self.json = entry
         self.user_id = entry["user"] if "user" in entry else None
-        self.bot = entry.get("subtype") == "bot_message" or "bot_id" in entry
         self.pinned_to = entry.get("pinned_to", False)
         self.has_replies = entry.get("reply_count", 0) > 0
-        self.thread_ts = float(entry.get("thread_ts", entry["ts"]))
-        self.thread_dt = datetime.fromtimestamp(self.thread_ts)
-        self.files = [SlackFile(f, slack) for f in entry.get("files", []) if f.get("mode", "tombstone") != "tombstone"]
+        thread_ts = entry.get("thread_ts")
+        if thread_ts is None or thread_ts == entry["ts"]:
+            # most messages are no replies, so reuse the parsed timestamp
+            self.thread_ts = self.ts
+        else:
+            self.thread_ts = float(thread_ts)
         self.is_tombstone = entry.get("subtype", None) == "tombstone"
 
+    @cached_property
+    def dt(self) -> datetime:
+        """
+        message timestamp as datetime
+        """
+        return datetime.fromtimestamp(self.ts)
+
+    @cached_property
+    def thread_dt(self) -> Optional[datetime]:
+        """
+        message timestamp for its thread as datetime
+        """
+        if self.thread_ts == self.ts:
+            return self.dt
+        return datetime.fromtimestamp(self.thread_ts) if self.thread_ts is not None else None
+
+    @cached_property
+    def files(self) -> List["SlackFile"]:
+        """
+        files part of this message
+        """
+        return [SlackFile(f, self._slack) for f in self.json.get("files", []) if f.get("mode", "tombstone") != "tombstone"]
+
+    @property
+    def bot(self) -> bool:
+        """
+        is the message written by a bot
+        """
+        return self.json.get("subtype") == "bot_message" or "bot_id" in self.json
+
     @cached_property
     def user(self) -> Optional[SlackUser]:
         """
@@ -442,7 +583,7 @@ class SlackMessage:
 
     def _delete_rated(self, as_user=True):
         # Do until being rate limited
-        return self._slack.call_rate_limited(lambda: self._slack.client.chat_delete(channel=self.channel.id, ts=self.json["ts"], as_user=as_user))
+        return self._slack.call_rate_limited(lambda: self._slack.client.chat_delete(channel=self.channel.id, ts=self.json["ts"], as_user=as_user), "chat.delete")
 
     def delete(self, as_user=True, files=False, replies=False) -> Optional[Exception]:
         """
@@ -470,7 +611,7 @@ class SlackMessage:
                     error = slack_file.delete()
                     if error:
                         return error
-            if replies and self.has_replies:
+            if replies:
                 for reply in self.replies():
                     error = reply.delete(as_user=as_user, files=files)
                     if error:
@@ -487,13 +628,15 @@ class SlackMessage:
         :return: generator of SlackMessage objects
         :rtype: SlackMessage
         """
+        if not self.has_replies:
+            return iter(())
         return self.channel.replies_to(self)
 
     def reactions(self) -> List["SlackMessageReaction"]:
         """
         list all reactions of this message
 
-        :return: generator of SlackMessageReaction objects
+        :return: list of SlackMessageReaction objects
         :rtype: SlackMessageReaction
         """
         self._slack.log.debug("list reactions of %s", self)
@@ -529,12 +672,19 @@ class ASlackReaction(ABC):
     internal model of a slack message reaction
     """
 
+    __slots__ = ("name", "count", "json", "_slack", "__dict__")
+
+    delete_scope = "reactions:write"
+    """
+    scope needed to remove a reaction
+    """
+
     name: str
     """
     reaction name
     """
 
-    count: int = 1
+    count: int
     """
     reaction count
     """
@@ -563,7 +713,7 @@ class ASlackReaction(ABC):
         """
         users
         """
-        return [self._slack.users.resolve_user(u) for u in self.json.get("users", [])]
+        return list(map(self._slack.users.resolve_user, self.json.get("users", [])))
 
     @abstractmethod
     def _context(self) -> str:
@@ -574,7 +724,7 @@ class ASlackReaction(ABC):
         raise NotImplementedError()
 
     def _delete_rated(self):
-        return self._slack.call_rate_limited(self._delete_impl)
+        return self._slack.call_rate_limited(self._delete_impl, "reactions.remove")
 
     def delete(self) -> Optional[Exception]:
         """
@@ -604,6 +754,8 @@ class SlackMessageReaction(ASlackReaction):
     internal model of a slack message reaction
     """
 
+    __slots__ = ("msg",)
+
     msg: SlackMessage
     """
     slack message this reaction is of
@@ -625,7 +777,7 @@ class SlackMessageReaction(ASlackReaction):
         return str(self.msg)
 
     def _delete_impl(self):
-        return self._slack.call_rate_limited(lambda: self._slack.client.reactions_remove(name=self.name, channel=self.msg.channel.id, timestamp=self.msg.json["ts"]))
+        return self._slack.client.reactions_remove(name=self.name, channel=self.msg.channel.id, timestamp=self.msg.json["ts"])
 
 
 class SlackFile:
@@ -633,6 +785,13 @@ class SlackFile:
     internal representation of a slack file
     """
 
+    __slots__ = ("id", "hidden_by_limit", "name", "title", "pinned_to", "mimetype", "size", "is_public", "user_id", "json", "_slack", "__dict__")
+
+    delete_scope = "files:write"
+    """
+    scope needed to delete a file
+    """
+
     id: str
     """
     file id
@@ -653,7 +812,7 @@ class SlackFile:
     file title
     """
 
-    pinned_to = False
+    pinned_to: bool
     """
     is the file pinned
     """
@@ -668,11 +827,16 @@ class SlackFile:
     the file size
     """
 
-    is_public = False
+    is_public: bool
     """
     is the file public
     """
 
+    user_id: Optional[str]
+    """
+    user id created this file
+    """
+
     json: JSONDict
     """
     the underlying slack response as json
@@ -693,6 +857,7 @@ class SlackFile:
         self.mimetype = entry.get("mimetype")
         self.size = entry.get("size", -1)
         self.is_public = entry.get("is_public", False)
+        self.user_id = entry.get("user")
 
         self.json = entry
         self._slack = slack
@@ -702,8 +867,8 @@ class SlackFile:
         """
         user created this file
         """
-        if "user" in self.json:
-            return self._slack.users.resolve_user(self.json["user"])
+        if self.user_id:
+            return self._slack.users.resolve_user(self.user_id)
         return None
 
     @staticmethod
@@ -752,7 +917,7 @@ class SlackFile:
         return str(self)
 
     def _delete_rated(self):
-        return self._slack.call_rate_limited(lambda: self._slack.client.files_delete(file=self.id))
+        return self._slack.call_rate_limited(lambda: self._slack.client.files_delete(file=self.id), "files.delete")
 
     def delete(self) -> Optional[Exception]:
         """
@@ -777,8 +942,7 @@ class SlackFile:
         :return: python requests Response object
         :rtype: Response
         """
-        headers = {"Authorization": "Bearer " + self._slack.token}
-        return requests.get(self.json["url_private_download"], headers=headers, timeout=10, **kwargs)
+        return self._slack.session.get(self.json["url_private_download"], headers=self._slack.auth_headers, timeout=10, **kwargs)
 
     def download_json(self) -> JSONDict:
         """
@@ -788,7 +952,7 @@ class SlackFile:
         :rtype: dict,list
         """
         res = self.download_response()
-        return res.json()
+        return json_loads(res.content)
 
     def download_content(self) -> bytes:
         """
@@ -800,7 +964,7 @@ class SlackFile:
         res = self.download_response()
         return res.content
 
-    def download_stream(self, chunk_size=1024) -> Iterator[bytes]:
+    def download_stream(self, chunk_size=65536) -> Iterator[bytes]:
         """
         downloads this file and returns a content stream
 
@@ -820,6 +984,33 @@ class SlackFile:
         file_name = path.join(directory, self.name)
         return self.download(file_name)
 
+    @staticmethod
+    def download_many(files: Iterable["SlackFile"], directory: str = ".", workers=4) -> List[str]:
+        """
+        downloads the given files to the given directory using a pool of worker threads
+
+        :param files: the files to download, e.g. the result of .files()
+        :type files: iterable of SlackFile
+        :param directory: target directory
+        :type directory: str
+        :param workers: maximal number of downloads in flight
+        :type workers: int
+        :return: the stored file paths in the order of the given files
+        :rtype: [str]
+        """
+        # file names repeat often, so prefix the id to not let two downloads write into the same file
+        targets: List[Tuple[SlackFile, str]] = []
+        claimed: Set[str] = set()
+        for sfile in files:
+            file_name = path.join(directory, sfile.name)
+            if file_name in claimed:
+                file_name = path.join(directory, f"{sfile.id}_{sfile.name}")
+            claimed.add(file_name)
+            targets.append((sfile, file_name))
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            return list(executor.map(lambda target: target[0].download(target[1]), targets))
+
     def download(self, file_name: Optional[str] = None) -> str:
         """
         downloads this file to the given file name
@@ -828,16 +1019,17 @@ class SlackFile:
         :rtype: str
         """
 
-        with open(file_name or self.name, "wb") as out:
-            for chunk in self.download_stream():
-                out.write(chunk)
+        with self.download_response(stream=True) as res, open(file_name or self.name, "wb") as out:
+            # decode gzip/deflate like iter_content does but let shutil copy in large blocks
+            res.raw.decode_content = True
+            shutil.copyfileobj(res.raw, out, 65536)
         return file_name or self.name
 
     def reactions(self) -> List["SlackFileReaction"]:
         """
         list all reactions of this file
 
-        :return: generator of SlackFileReaction objects
+        :return: list of SlackFileReaction objects
         :rtype: SlackFileReaction
         """
         self._slack.log.debug("list reactions of %s", self)
@@ -864,6 +1056,8 @@ class SlackFileReaction(ASlackReaction):
     internal model of a slack message reaction
     """
 
+    __slots__ = ("file",)
+
     file: SlackFile
     """
     slack file this reaction is of
@@ -885,26 +1079,126 @@ class SlackFileReaction(ASlackReaction):
         return str(self.file)
 
     def _delete_impl(self):
-        return self._slack.call_rate_limited(lambda: self._slack.client.reactions_remove(name=self.name, file=self.file.id))
+        return self._slack.client.reactions_remove(name=self.name, file=self.file.id)
+
+
+@lru_cache(maxsize=128)
+def _parse_time_str(time_str: str) -> str:
+    # fast path for the documented YYYYMMDD and YYYYMMDDHHMM formats, datetime validates the ranges
+    if len(time_str) in (8, 12) and time_str.isdigit():
+        hour = int(time_str[8:10]) if len(time_str) == 12 else 0
+        minute = int(time_str[10:12]) if len(time_str) == 12 else 0
+        time_d = datetime(int(time_str[0:4]), int(time_str[4:6]), int(time_str[6:8]), hour, minute).timetuple()
+    elif len(time_str) == 8:
+        time_d = time.strptime(time_str, "%Y%m%d")
+    else:
+        time_d = time.strptime(time_str, "%Y%m%d%H%M")
+    sec = time.mktime(time_d)
+    return str(int(round(sec)))
 
 
 def _parse_time(time_str: TimeIsh, log: SlackLogger) -> Optional[str]:
     if time_str is None:
         return None
-    if isinstance(time_str, (int, float)):
-        return str(int(round(time_str)))
+    if isinstance(time_str, int):
+        return str(int(time_str))
+    if isinstance(time_str, float):
+        # keep sub-second precision in the slack ts format
+        return f"{time_str:.6f}"
     try:
-        if len(time_str) == 8:
-            time_d = time.strptime(time_str, "%Y%m%d")
-        else:
-            time_d = time.strptime(time_str, "%Y%m%d%H%M")
-        sec = time.mktime(time_d)
-        return str(int(round(sec)))
+        return _parse_time_str(time_str)
     except ValueError:
         log.exception("error parsing date %s (%s)", time_str, type(time_str))
         return None
 
 
+# requests per minute of the slack web api rate limit tiers
+_TIER_RATES = {1: 1, 2: 20, 3: 50, 4: 100}
+
+# rate limit tier of the used api methods
+_METHOD_TIERS = {
+    "chat.delete": 3,
+    "conversations.history": 3,
+    "conversations.list": 2,
+    "conversations.members": 4,
+    "conversations.replies": 3,
+    "files.delete": 3,
+    "files.list": 3,
+    "reactions.list": 2,
+    "reactions.remove": 2,
+    "users.info": 4,
+    "users.list": 2,
+    "users.lookupByEmail": 3,
+}
+
+# user ids, W is used for enterprise grid users
+_USER_ID = re.compile(r"[UW][A-Z0-9]+")
+
+
+def _prefetch(items: Iterator[Any], size: int) -> Iterator[Any]:
+    # consume the iterator in a background thread staying at most size entries ahead of the caller
+    buffer: Queue = Queue(maxsize=size)
+    stop = Event()
+
+    def put(entry: Tuple[str, Any]) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(("item", item)):
+                    return
+            put(("end", None))
+        except Exception as error:
+            put(("error", error))
+
+    Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            kind, value = buffer.get()
+            if kind == "end":
+                return
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        # stop the producer if the caller is not interested anymore
+        stop.set()
+
+
+def _retry_after(headers: Dict[str, Any], default=1.0) -> float:
+    # header names are not guaranteed to be capitalized
+    for key, value in headers.items():
+        if key.lower() == "retry-after":
+            try:
+                return float(value)
+            except ValueError:
+                break
+    return default
+
+
+def _retry_handlers(max_retry_count=5) -> List[RetryHandler]:
+    # exponential back off with jitter for transient network and server errors, rate limits are handled by call_rate_limited
+    backoff = BackoffRetryIntervalCalculator(backoff_factor=1.0)
+    return [
+        ConnectionErrorRetryHandler(max_retry_count=max_retry_count, interval_calculator=backoff),
+        ServerErrorRetryHandler(max_retry_count=max_retry_count, interval_calculator=backoff),
+    ]
+
+
+def _download_session(pool_maxsize=32) -> Session:
+    # keep-alive pool large enough for concurrent downloads from files.slack.com
+    session = Session()
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize))
+    return session
+
+
 ByKey = TypeVar("ByKey")
 
 
@@ -915,11 +1209,9 @@ class ByKeyLookup(Generic[ByKey]):
 
     def __init__(self, arr: List[ByKey], keys: Callable[[ByKey], List[str]]):
         self._arr = arr
-        self._lookup: Dict[str, ByKey] = {}
+        self._lookup: Dict[str, ByKey] = {k: v for v in arr for k in keys(v)}
+        self._ids: Set[int] = {id(v) for v in arr}
         self.keys = keys
-        for v in arr:
-            for k in keys(v):
-                self._lookup[k] = v
 
     def get(self, key: str) -> Optional[ByKey]:
         """
@@ -928,15 +1220,17 @@ class ByKeyLookup(Generic[ByKey]):
         return self[key]
 
     def __contains__(self, key: Union[ByKey, str]):
-        return key in self._lookup or key in self._arr
+        if isinstance(key, str):
+            return key in self._lookup
+        return id(key) in self._ids
 
     def append(self, val: ByKey):
         """
         appends the given value to this list
         """
         self._arr.append(val)
-        for k in self.keys(val):
-            self._lookup[k] = val
+        self._ids.add(id(val))
+        self._lookup.update(dict.fromkeys(self.keys(val), val))
 
     def __getitem__(self, key: Union[str, int]) -> Optional[ByKey]:
         if isinstance(key, int):
@@ -944,6 +1238,9 @@ class ByKeyLookup(Generic[ByKey]):
         return self._lookup.get(key, None)
 
     def __getattr__(self, name: str) -> Optional[ByKey]:
+        if name.startswith("_"):
+            # private and dunder probes (copy, pickle, IPython) are no lookup keys, use item access for those
+            raise AttributeError(name)
         return self[name]
 
     def __len__(self) -> int:
@@ -980,6 +1277,8 @@ class SlackChannels:
         return self._slack.channels[key] or self._slack.groups[key] or self._slack.mpim[key] or self._slack.ims[key]
 
     def __getattr__(self, name: str) -> Optional[SlackChannel]:
+        if name.startswith("_"):
+            raise AttributeError(name)
         return self[name]
 
     def __len__(self) -> int:
@@ -1007,6 +1306,8 @@ class SlackUsers:
         self._slack = slack
         self._dummy_users: List[SlackUser] = []
         self._lookup: Dict[str, SlackUser] = {}
+        # keys that could not be resolved via users.info
+        self._missing: Set[str] = set()
         self._loaded = False
         self._arr: List[SlackUser] = []
 
@@ -1015,23 +1316,37 @@ class SlackUsers:
             return self._arr
 
         self._loaded = True
-        raw_users = self._slack.safe_paginated_api(lambda kw: self._slack.client.users_list(**kw), "members", ["users:read (bot, user)"], "users.list")
+        raw_users = self._slack.cached_api("users", self._slack.safe_paginated_api(lambda kw: self._slack.client.users_list(**kw), "members", ["users:read (bot, user)"], "users.list"))
         self._arr = [SlackUser(m, self._slack) for m in raw_users]
         self._slack.log.debug("collected users %s", self._arr)
 
         for user in self._arr:
-            self._lookup[user.id] = user
-            self._lookup[user.name] = user
+            self._index(user)
         return self._arr
 
-    def _load_single(self, user_id: str) -> Optional[SlackUser]:
-        res = self._slack.safe_api(lambda: self._slack.client.users_info(user=user_id), "user", None, ["users:read (bot, user)"], "users.info")
+    def _index(self, user: SlackUser):
+        self._lookup[user.id] = user
+        self._lookup[user.name] = user
+        if user.email:
+            self._lookup[user.email] = user
+
+    def _load_single(self, key: str) -> Optional[SlackUser]:
+        if key in self._missing:
+            return None
+        if "@" in key:
+            res = self._slack.safe_api(lambda: self._slack.client.users_lookupByEmail(email=key), "user", None, ["users:read.email"], "users.lookupByEmail")
+        elif _USER_ID.fullmatch(key):
+            res = self._slack.safe_api(lambda: self._slack.client.users_info(user=key), "user", None, ["users:read (bot, user)"], "users.info")
+        else:
+            # user names can only be found in the full list
+            self._load()
+            return self._lookup.get(key)
         if res is None:
+            self._missing.add(key)
             return None
         user = SlackUser(res, self._slack)
         self._slack.log.debug("collected single user %s", user)
-        self._lookup[user.id] = user
-        self._lookup[user.name] = user
+        self._index(user)
         return user
 
     def __contains__(self, key: Union[SlackUser, str]) -> bool:
@@ -1047,11 +1362,16 @@ class SlackUsers:
 
     def __getitem__(self, key: Union[str, int]) -> Optional[SlackUser]:
         if isinstance(key, int):
-            if key < 0 or key < len(self._dummy_users):
+            dummies = len(self._dummy_users)
+            if 0 <= key < dummies:
                 return self._dummy_users[key]
             arr = self._load()
-            shifted_key = key - len(self._dummy_users)
-            return arr[shifted_key] if 0 <= shifted_key < len(arr) else None
+            # positions follow the iteration order: dummy users first, then the loaded ones
+            if key < 0:
+                key += dummies + len(arr)
+            if 0 <= key < dummies:
+                return self._dummy_users[key]
+            return arr[key - dummies] if dummies <= key < dummies + len(arr) else None
 
         if key in self._lookup:
             return self._lookup.get(key, None)
@@ -1066,6 +1386,8 @@ class SlackUsers:
         return self[key]
 
     def __getattr__(self, name: str) -> Optional[SlackUser]:
+        if name.startswith("_"):
+            raise AttributeError(name)
         return self[name]
 
     def __len__(self) -> int:
@@ -1102,6 +1424,10 @@ class SlackUsers:
         :type user_id: str
         :rtype: SlackUser
         """
+        # fast path for already known and dummy users
+        user = self._lookup.get(user_id)
+        if user is not None:
+            return user
         user = self.get(user_id)
         if user is None:
             self._slack.log.error("user %s not found - generating dummy one", user_id)
@@ -1130,14 +1456,38 @@ class SlackCleaner:
     """
     underlying WebClient instance
     """
+    session: Session
+    """
+    requests session used for downloading files
+    """
     sleep_for: float
     """
     sleep for the given seconds after a file/message was deleted
     """
+    rate_limiter: TokenBucket
+    """
+    token bucket limiting delete calls to one per sleep_for seconds on average
+    """
     page_limit: int
     """
     number of elements fetched per page
     """
+    cache_dir: Optional[str]
+    """
+    directory to cache the user and channel lists in, disabled if None
+    """
+    cache_ttl: float
+    """
+    number of seconds a cached list is valid
+    """
+    tier_limits: bool
+    """
+    whether each api method is throttled to the request rate of its slack rate limit tier
+    """
+    prefetch_pages: int
+    """
+    number of cursor pages fetched ahead in a background thread
+    """
     users: SlackUsers
     """
     slack users
@@ -1147,7 +1497,7 @@ class SlackCleaner:
     alias of .conversations with advanced accessors
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         token: Union[str, WebClient],
         sleep_for=0,
@@ -1155,8 +1505,14 @@ class SlackCleaner:
         client: Optional[WebClient] = None,
         logger: Optional[Logger] = None,
         show_progress=True,
-        page_limit=200,
+        page_limit=999,
         team_id: Optional[str] = None,
+        burst=1,
+        session: Optional[Session] = None,
+        cache_dir: Optional[str] = None,
+        cache_ttl: float = 3600,
+        tier_limits=False,
+        prefetch_pages=0,
     ):
         """
         :param token: the slack token, see README.md for details
@@ -1173,14 +1529,31 @@ class SlackCleaner:
         :type logger: Logger
         :param show_progress: show a progress upon deleting an element on the console
         :type show_progress: bool
-        :param page_limit: number of elements to fetch per page
+        :param page_limit: number of elements to fetch per page, the cursor based slack methods allow up to 999
         :type page_limit: int
+        :param burst: number of delete calls allowed in a row before sleep_for kicks in
+        :type burst: int
+        :param cache_dir: optional directory to cache the user and channel lists in
+        :type cache_dir: str
+        :param cache_ttl: number of seconds a cached list is valid
+        :type cache_ttl: float
+        :param tier_limits: throttle each api method to the request rate of its slack rate limit tier
+        :type tier_limits: bool
+        :param prefetch_pages: number of cursor pages fetched ahead in a background thread while the current one is consumed, 0 to disable
+        :type prefetch_pages: int
         """
 
         self.log = SlackLogger(log_to_file, logger=logger, show_progress=show_progress)
-        self.sleep_for = sleep_for
+        self.sleep_for = sleep_for or 0
+        self.rate_limiter = TokenBucket(1.0 / self.sleep_for if self.sleep_for > 0 else None, burst)
         self.token = token if isinstance(token, str) else "unknown"
         self.page_limit = page_limit
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.tier_limits = tier_limits
+        self.prefetch_pages = prefetch_pages
+        self._method_limiters: Dict[str, TokenBucket] = {}
+        self._method_limiters_lock = Lock()
 
         self.log.debug("start")
 
@@ -1189,18 +1562,61 @@ class SlackCleaner:
         elif client:
             self.client = client
         else:
-            client = WebClient(token=token, team_id=team_id)
+            client = WebClient(token=token, team_id=team_id, retry_handlers=_retry_handlers())
             self.client = client
 
+        # reuse connections across downloads
+        self.session = session or _download_session()
+        self._owns_session = session is None
+
         self.users = SlackUsers(self)
         self.c = SlackChannels(self)  # pylint: disable=invalid-name
 
+    def close(self):
+        """
+        releases the pooled download connections, a session given by the caller is left open
+        """
+        self.log.flush_progress()
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @cached_property
+    def _all_conversations(self) -> Optional[List[JSONDict]]:
+        # a single listing of all conversation types, None if it is not allowed by the token scopes
+        def entries() -> Iterator[JSONDict]:
+            kw: Dict[str, Any] = {"types": "public_channel,private_channel,mpim,im", "limit": self.page_limit}
+            while True:
+                res = self.call_rate_limited(lambda: self.client.conversations_list(**kw), "conversations.list")
+                yield from res.get("channels") or []
+                next_cursor = (res.get("response_metadata") or {}).get("next_cursor")
+                if not next_cursor:
+                    break
+                kw["cursor"] = next_cursor
+
+        try:
+            return self.cached_api("conversations", entries())
+        except SlackApiError as error:
+            self.log.debug("cannot list all conversation types at once, listing them one by one: %s", error.response["error"])
+            return None
+
+    def _list_conversations(self, types: str, scope: str) -> List[JSONDict]:
+        all_conversations = self._all_conversations
+        if all_conversations is not None:
+            return all_conversations
+        return self.cached_api(types, self.safe_paginated_api(lambda kw: self.client.conversations_list(types=types, **kw), "channels", [scope], f"conversations.list ({types})"))
+
     @cached_property
     def channels(self) -> ByKeyLookup[SlackChannel]:
         """
         list of channels
         """
-        raw_channels = self.safe_paginated_api(lambda kw: self.client.conversations_list(types="public_channel", **kw), "channels", ["channels:read"], "conversations.list (public_channel)")
+        raw_channels = self._list_conversations("public_channel", "channels:read")
         channels = [SlackChannel(m, SlackChannelType.PUBLIC, self) for m in raw_channels if m.get("is_channel") and not m.get("is_private")]
         self.log.debug("collected channels %s", channels)
         return ByKeyLookup(channels, lambda v: [v.name, v.id])
@@ -1210,8 +1626,8 @@ class SlackCleaner:
         """
         list of groups aka private channels
         """
-        raw_groups = self.safe_paginated_api(lambda kw: self.client.conversations_list(types="private_channel", **kw), "channels", ["groups:read"], "conversations.list (private_channel)")
-        groups = [SlackChannel(m, SlackChannelType.PRIVATE, self) for m in raw_groups if (m.get("is_channel") or m.get("is_group")) and m.get("is_private")]
+        raw_groups = self._list_conversations("private_channel", "groups:read")
+        groups = [SlackChannel(m, SlackChannelType.PRIVATE, self) for m in raw_groups if (m.get("is_channel") or m.get("is_group")) and m.get("is_private") and not m.get("is_mpim")]
         self.log.debug("collected groups %s", groups)
         return ByKeyLookup(groups, lambda v: [v.name, v.id])
 
@@ -1220,7 +1636,7 @@ class SlackCleaner:
         """
         list of multi person instant message channels
         """
-        raw_mpim = self.safe_paginated_api(lambda kw: self.client.conversations_list(types="mpim", **kw), "channels", ["mpim:read"], "conversations.list (mpim)")
+        raw_mpim = self._list_conversations("mpim", "mpim:read")
         mpim = [SlackChannel(m, SlackChannelType.MPIM, self) for m in raw_mpim if m.get("is_mpim")]
         self.log.debug("collected mpim %s", mpim)
         return ByKeyLookup(mpim, lambda v: [v.name, v.id])
@@ -1230,11 +1646,44 @@ class SlackCleaner:
         """
         list of instant messages = direct messages
         """
-        raw_ims = self.safe_paginated_api(lambda kw: self.client.conversations_list(types="im", **kw), "channels", ["im:read"], "conversations.list (im)")
+        raw_ims = self._list_conversations("im", "im:read")
         ims = [SlackDirectMessage(m, self) for m in raw_ims if m.get("is_im")]
         self.log.debug("collected ims %s", ims)
         return ByKeyLookup(ims, lambda v: [v.name, v.id])
 
+    def prefetch(self, workers=4) -> "SlackCleaner":
+        """
+        loads the users and all kinds of channels concurrently instead of lazily one after the other
+
+        :param workers: maximal number of list calls in flight
+        :type workers: int
+        :return: this instance for chaining
+        :rtype: SlackCleaner
+        """
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            # len loads the full user list
+            users = executor.submit(len, self.users)
+            # load the shared listing once before the single types pick their conversations from it
+            executor.submit(getattr, self, "_all_conversations").result()
+            lists = [executor.submit(getattr, self, name) for name in ("channels", "groups", "mpim")]
+            users.result()
+            # the names of ims are resolved via the users, so wait for them to avoid single users.info calls
+            lists.append(executor.submit(getattr, self, "ims"))
+            for future in lists:
+                future.result()
+        return self
+
+    @cached_property
+    def channels_by_user(self) -> Dict[str, List[SlackChannel]]:
+        """
+        conversations by member user id, requires the members of all conversations
+        """
+        by_user: Dict[str, List[SlackChannel]] = {}
+        for channel in self.conversations:
+            for user_id in channel.member_ids:
+                by_user.setdefault(user_id, []).append(channel)
+        return by_user
+
     @cached_property
     def conversations(self) -> List[Union[SlackChannel, SlackDirectMessage]]:
         """
@@ -1249,26 +1698,129 @@ class SlackCleaner:
         """
         return self.users.myself
 
-    def call_rate_limited(self, fun: Callable) -> Any:
+    def _method_limiter(self, method: Optional[str]) -> Optional[TokenBucket]:
+        if not self.tier_limits or not method:
+            return None
+        # strip hints like "conversations.list (im)"
+        name = method.split(" ", 1)[0]
+        tier = _METHOD_TIERS.get(name)
+        if tier is None:
+            return None
+        with self._method_limiters_lock:
+            if name not in self._method_limiters:
+                self._method_limiters[name] = TokenBucket(_TIER_RATES[tier] / 60.0)
+            return self._method_limiters[name]
+
+    def call_rate_limited(self, fun: Callable, method: Optional[str] = None) -> Any:
         """
         call slack api with rate handling
 
         :param fun: function to call
         :type fun: Callable
+        :param method: method name for throttling to its rate limit tier
+        :type method: str
         """
+        limiter = self._method_limiter(method)
         # Do until being rate limited
         while True:
+            # respect a back off triggered by another thread
+            self.rate_limiter.wait()
+            if limiter:
+                limiter.consume()
             try:
                 return fun()
             except SlackApiError as error:
-                if error.response["error"] == "ratelimited":
+                if error.response.status_code == 429 or error.response.get("error") == "ratelimited":
                     # The `Retry-After` header will tell you how long to wait before retrying
-                    delay = int(error.response.headers["Retry-After"])
+                    delay = _retry_after(error.response.headers)
                     self.log.debug("Rate limited. Retrying in %s seconds", delay)
-                    sleep(delay)
+                    # block all workers and add some jitter to not retry all at once
+                    self.rate_limiter.penalize(delay)
+                    sleep(delay + random.uniform(0, min(1.0, delay / 2)))
                     continue
                 raise error
 
+    @cached_property
+    def auth_headers(self) -> Dict[str, str]:
+        """
+        authorization headers for downloading private files
+        """
+        token = getattr(self.client, "token", None) or self.token
+        return {"Authorization": "Bearer " + token}
+
+    @cached_property
+    def _cache_key(self) -> str:
+        token = getattr(self.client, "token", None)
+        # org wide tokens select the workspace via the team_id
+        team_id = (getattr(self.client, "default_params", None) or {}).get("team_id") or ""
+        if token:
+            identity = f"{token}:{team_id}"
+        else:
+            # no token to tell the accounts apart, ask slack who is calling
+            auth_team_id, user_id = self.safe_api(self.client.auth_test, ["team_id", "user_id"], [None, None], [], "auth.test")
+            identity = f"{auth_team_id}:{user_id}:{team_id}"
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16]
+
+    def clear_cache(self) -> int:
+        """
+        forgets the loaded users and conversations and removes their cached lists from the cache_dir such that they are fetched again
+
+        :return: number of removed cache files
+        :rtype: int
+        """
+        self.users = SlackUsers(self)
+        for name in ("_all_conversations", "channels", "groups", "mpim", "ims", "conversations", "channels_by_user"):
+            self.__dict__.pop(name, None)
+
+        if not self.cache_dir:
+            return 0
+        removed = 0
+        for file_name in glob.glob(path.join(glob.escape(self.cache_dir), f"{self._cache_key}.*.json")):
+            try:
+                os.remove(file_name)
+                removed += 1
+            except OSError as error:
+                self.log.warning("cannot remove cache %s: %s", file_name, error)
+        return removed
+
+    def cached_api(self, name: str, entries: Iterable[JSONDict]) -> List[JSONDict]:
+        """
+        wrapper for caching a list result on disk in the cache_dir
+
+        :param name: cache entry name
+        :type name: str
+        :param entries: lazy list result, e.g. of safe_paginated_api, only consumed if there is no valid cache entry
+        :type entries: Iterable[dict]
+        :return: list of json entries
+        :rtype: [dict]
+        """
+        if not self.cache_dir:
+            return list(entries)
+        file_name = path.join(self.cache_dir, f"{self._cache_key}.{name}.json")
+        try:
+            if time.time() - path.getmtime(file_name) < self.cache_ttl:
+                with open(file_name, "rb") as cache_file:
+                    cached = json_loads(cache_file.read())
+                self.log.debug("loaded %s from cache %s", name, file_name)
+                return cached
+        except (OSError, ValueError):
+            pass
+
+        fetched = list(entries)
+        if not fetched:
+            # do not keep errors like missing scopes around
+            return fetched
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # write to a temporary file first such that readers never see a partial file
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+                json.dump(fetched, cache_file)
+            os.replace(tmp_name, file_name)
+        except OSError as error:
+            self.log.warning("cannot write cache %s: %s", file_name, error)
+        return fetched
+
     def safe_api(self, fun: Callable, attr: Union[str, Sequence[str]], default_value=None, scopes: Optional[List[str]] = None, method: Optional[str] = None) -> Any:
         """
         wrapper for handling common errors
@@ -1286,7 +1838,7 @@ class SlackCleaner:
         scopes = scopes or []
         method = method or str(fun)
         try:
-            res = self.call_rate_limited(fun)
+            res = self.call_rate_limited(fun, method)
             if not res["ok"]:
                 self.log.warning("%s: unknown occurred %s", method, res)
                 return default_value
@@ -1317,17 +1869,29 @@ class SlackCleaner:
         """
         limit = self.page_limit
         next_page = None
+        next_cursor = None
 
         def list_paging_page():
+            if next_cursor:
+                return fun({"cursor": next_cursor, "limit": limit})
             if not next_page:
                 # initial call
                 return fun({"count": limit})
             return fun({"page": next_page, "count": limit})
 
         while True:
-            page, meta = self.safe_api(list_paging_page, [attr, "paging"], [[], {}], scopes, method)
-            yield from page
-            if not meta:
+            page, meta, cursor_meta = self.safe_api(list_paging_page, [attr, "paging", "response_metadata"], [[], {}, {}], scopes, method)
+            if page:
+                yield from page
+            # release the consumed page before fetching the next one
+            empty = not page
+            del page
+            if cursor_meta and cursor_meta.get("next_cursor"):
+                # switch to cursor mode if the server supports it
+                next_cursor = cursor_meta["next_cursor"]
+                continue
+            if not meta or next_cursor or empty:
+                # an empty page means the paging totals are outdated, so save the extra call
                 return
             total_pages = meta.get("pages", 1)
             current_page = meta.get("page", 1)
@@ -1349,20 +1913,29 @@ class SlackCleaner:
         :type scopes: List[str]
         """
         limit = self.page_limit
-        next_cursor = None
-
-        def list_cursor_page():
-            if not next_cursor:
-                # initial call
-                return fun({"limit": limit})
-            return fun({"cursor": next_cursor, "limit": limit})
 
-        while True:
-            page, meta = self.safe_api(list_cursor_page, [attr, "response_metadata"], [[], {}], scopes, method)
+        def pages() -> Iterator[List[Any]]:
+            next_cursor = None
+
+            def list_cursor_page():
+                if not next_cursor:
+                    # initial call
+                    return fun({"limit": limit})
+                return fun({"cursor": next_cursor, "limit": limit})
+
+            while True:
+                page, meta = self.safe_api(list_cursor_page, [attr, "response_metadata"], [[], {}], scopes, method)
+                yield page or []
+                # release the consumed page before fetching the next one
+                del page
+                if not meta or not meta.get("next_cursor"):
+                    break
+                next_cursor = meta["next_cursor"]
+
+        for page in _prefetch(pages(), self.prefetch_pages) if self.prefetch_pages > 0 else pages():
             yield from page
-            if not meta or not meta.get("next_cursor"):
-                break
-            next_cursor = meta["next_cursor"]
+            # release the consumed page before fetching the next one
+            del page
 
     def post_delete(self, obj: Union[SlackMessage, SlackFile, ASlackReaction], error: Optional[SlackApiError] = None):
         """
@@ -1370,24 +1943,15 @@ class SlackCleaner:
         """
         self.log.deleted(error)
 
-        ctx = ""
-        if isinstance(obj, SlackMessage):
-            ctx = "chat:write"
-        elif isinstance(obj, SlackFile):
-            ctx = "files:write"
-        else:
-            ctx = "reactions:write"
-
         if error:
             if error.response["error"] == "missing_scope":
-                self.log.warning("cannot delete entry: %s: missing '%s' scope", obj, ctx)
+                self.log.warning("cannot delete entry: %s: missing '%s' scope", obj, obj.delete_scope)
             else:
                 self.log.warning("cannot delete entry: %s: %s", obj, error.response["error"])
         else:
             self.log.debug("deleted entry: %s", obj)
 
-        if self.sleep_for > 0:
-            sleep(self.sleep_for)
+        self.rate_limiter.consume()
 
     def files(
         self, user: Union[str, SlackUser, None] = None, after: TimeIsh = None, before: TimeIsh = None, types: Optional[str] = None, channel: Union[str, SlackChannel, None] = None
@@ -1410,7 +1974,7 @@ class SlackCleaner:
         """
         return SlackFile.list(self, user=user, after=after, before=before, types=types, channel=channel)
 
-    def msgs(self, channels: Optional[Iterable[SlackChannel]] = None, after: TimeIsh = None, before: TimeIsh = None, with_replies=False) -> Iterator[SlackMessage]:
+    def msgs(self, channels: Optional[Iterable[SlackChannel]] = None, after: TimeIsh = None, before: TimeIsh = None, with_replies=False, workers=1) -> Iterator[SlackMessage]:
         """
         list all known slack messages for the given parameter as a generator
 
@@ -1421,11 +1985,63 @@ class SlackCleaner:
         :param before: limit to entries before the given timestamp
         :type before: int,str,time
         :type with_replies: boolean
-        :return: generator of SlackMessage objects
+        :param workers: number of channels fetched concurrently, the messages are still returned channel by channel
+        :type workers: int
         :return: generator of SlackMessage objects
         :rtype: SlackMessage
         """
         if not channels:
             channels = self.conversations
-        for channel in channels:
-            yield from channel.msgs(after=after, before=before, with_replies=with_replies)
+        if workers <= 1:
+            for channel in channels:
+                yield from channel.msgs(after=after, before=before, with_replies=with_replies)
+            return
+
+        def fetch(channel: SlackChannel) -> List[SlackMessage]:
+            return list(channel.msgs(after=after, before=before, with_replies=with_replies))
+
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for channel in channels:
+                    pending.append(executor.submit(fetch, channel))
+                    if len(pending) >= workers:
+                        yield from pending.popleft().result()
+                while pending:
+                    yield from pending.popleft().result()
+            finally:
+                # stop fetching channels that are not needed anymore
+                for future in pending:
+                    future.cancel()
+
+    def delete_many(self, items: Iterable[Union[SlackMessage, SlackFile, ASlackReaction]], workers=3, **kwargs) -> List[Exception]:
+        """
+        deletes the given messages, files, or reactions using a pool of worker threads,
+        slack has no bulk delete endpoint, so the single delete calls are overlapped instead
+
+        :param items: the entries to delete, e.g. the result of .msgs()
+        :type items: iterable of SlackMessage, SlackFile, or reactions
+        :param workers: maximal number of delete calls in flight
+        :type workers: int
+        :param kwargs: additional arguments forwarded to the delete method, e.g. as_user=False
+        :return: list of errors that occurred
+        :rtype: [Exception]
+        """
+        errors: List[Exception] = []
+        pending: Set[Future] = set()
+
+        def collect(done: Iterable[Future]):
+            for future in done:
+                error = future.result()
+                if error:
+                    errors.append(error)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for item in items:
+                if len(pending) >= 2 * workers:
+                    # limit the number of queued entries to not consume the whole generator upfront
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(executor.submit(item.delete, **kwargs))
+            collect(wait(pending).done)
+        return errors
@@ -4,6 +4,7 @@
  multiple predicates can be combined using & and |
 """
 import re
+from operator import attrgetter
 from typing import Optional, Iterable, List, Any, Callable
 
 from .model import SlackUser
@@ -138,9 +139,10 @@ def match(pattern: str, attr: str = "name") -> Predicate:
     :return: Predicate
     :rtype: Predicate
     """
-    regex = re.compile("^" + pattern + "$", re.I)
+    search = re.compile("^" + pattern + "$", re.I).search
+    get_attr = attrgetter(attr)
 
-    return Predicate(lambda channel: regex.search(getattr(channel, attr)) is not None)
+    return Predicate(lambda channel: search(get_attr(channel)) is not None)
 
 
 def is_name(channel_name: str) -> Predicate:
@@ -176,8 +178,9 @@ def match_user(pattern: str) -> Predicate:
     :return: Predicate
     :rtype: Predicate
     """
-    regex = re.compile("^" + pattern + "$", re.I)
-    return Predicate(lambda user: any(regex.search(u or "") for u in [user.id, user.name, user.display_name, user.email, user.real_name]))
+    search = re.compile("^" + pattern + "$", re.I).search
+    get_attrs = attrgetter("id", "name", "display_name", "email", "real_name")
+    return Predicate(lambda user: any(search(u or "") for u in get_attrs(user)))
 
 
 def is_member(user: SlackUser) -> Predicate:
@@ -189,7 +192,7 @@ def is_member(user: SlackUser) -> Predicate:
     :return: Predicate
     :rtype: Predicate
     """
-    return Predicate(lambda channel: user in channel.members)
+    return Predicate(lambda channel: channel.has_member(user))
 
 
 def by_user(user: SlackUser) -> Predicate:
@@ -201,7 +204,8 @@ def by_user(user: SlackUser) -> Predicate:
     :return: Predicate
     :rtype: Predicate
     """
-    return Predicate(lambda msg_or_file: msg_or_file.user == user)
+    user_id = user.id
+    return Predicate(lambda msg_or_file: msg_or_file.user_id == user_id)
 
 
 def by_users(users: Iterable[SlackUser]) -> Predicate:
@@ -213,5 +217,5 @@ def by_users(users: Iterable[SlackUser]) -> Predicate:
     :return: Predicate
     :rtype: Predicate
     """
-    users = set(users)
-    return Predicate(lambda msg_or_file: msg_or_file.user in users)
+    user_ids = frozenset(user.id for user in users)
+    return Predicate(lambda msg_or_file: msg_or_file.user_id in user_ids)
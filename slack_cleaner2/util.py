@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 """
-date util module
+date and rate util module
 """
 import time
 from datetime import datetime
+from threading import Lock
+from typing import Optional
 
 from dateutil import relativedelta
 
@@ -17,3 +19,72 @@ def a_while_ago(years=0, months=0, days=0, leapdays=0, weeks=0, hours=0, minutes
 
     unixtime = time.mktime(ago.timetuple())
     return unixtime
+
+
+class TokenBucket:
+    """
+    thread-safe token bucket for limiting the rate of api calls while allowing short bursts
+    """
+
+    def __init__(self, rate: Optional[float] = None, capacity: int = 1):
+        """
+        :param rate: tokens refilled per second, None for no limit
+        :type rate: float
+        :param capacity: maximal number of tokens, i.e. the allowed burst size
+        :type capacity: int
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = Lock()
+
+    def _refill(self, now: float):
+        if now <= self._last:
+            return
+        if self.rate:
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def consume(self, tokens=1) -> float:
+        """
+        takes the given number of tokens and blocks until they are available
+
+        :return: the seconds slept
+        :rtype: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._blocked_until - now)
+            if self.rate:
+                self._refill(now)
+                self._tokens -= tokens
+                if self._tokens < 0:
+                    delay = max(delay, -self._tokens / self.rate)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def wait(self) -> float:
+        """
+        blocks while the bucket is penalized without taking a token
+
+        :return: the seconds slept
+        :rtype: float
+        """
+        with self._lock:
+            delay = max(0.0, self._blocked_until - time.monotonic())
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def penalize(self, seconds: float):
+        """
+        drains the bucket and blocks all consumers for the given seconds, e.g. after a Retry-After response
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            self._tokens = 0.0
+            self._last = max(now, self._blocked_until)
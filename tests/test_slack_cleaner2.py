@@ -4,11 +4,30 @@
 """Tests for `slack_cleaner2` package."""
 
 import pytest
+from slack_sdk import WebClient
+from slack_sdk.web import SlackResponse
 
 # from slack_cleaner2 import slack_cleaner2
 # from slack_cleaner2 import cli
 
 
+class FakeClient(WebClient):
+    """WebClient answering the api calls with the given handlers instead of the network."""
+
+    def __init__(self, handlers, **kwargs):
+        super().__init__(token="xoxp-test", **kwargs)
+        self.handlers = handlers
+        self.calls = []
+
+    def api_call(self, api_method, *, params=None, json=None, data=None, **kwargs):  # pylint: disable=arguments-differ
+        self.calls.append(api_method)
+        args = {**(params or {}), **(json or {}), **(data or {})}
+        res = self.handlers[api_method](**args)
+        # handlers return the body or a (status, headers, body) tuple
+        status, headers, body = res if isinstance(res, tuple) else (200, {}, res)
+        return SlackResponse(client=self, http_verb="POST", api_url=api_method, req_args=args, data=body, headers=headers, status_code=status).validate()
+
+
 @pytest.fixture
 def response():
     """Sample pytest fixture.
@@ -28,3 +47,270 @@ def test_content(response):
 def test_command_line_interface():
     """Test the CLI."""
     # TODO
+
+
+def test_token_bucket():
+    """Test the token bucket rate limiter."""
+    from slack_cleaner2.util import TokenBucket
+
+    unlimited = TokenBucket()
+    assert unlimited.consume() == 0
+    assert unlimited.consume() == 0
+
+    bucket = TokenBucket(rate=100, capacity=2)
+    assert bucket.consume() == 0
+    assert bucket.consume() == 0
+    assert bucket.consume() > 0
+
+    bucket.penalize(0.05)
+    assert bucket.consume() >= 0.04
+
+
+def test_logger_groups():
+    """Test the counting of nested logger groups."""
+    from slack_cleaner2.logger import SlackLogger
+
+    log = SlackLogger(show_progress=False)
+    log.deleted()
+    with log.group("outer") as outer:
+        log.deleted()
+        with log.group("inner") as inner:
+            log.deleted(Exception("error"))
+            log.deleted()
+        log.deleted()
+    log.deleted()
+
+    assert (inner.deleted, inner.errors) == (1, 1)
+    assert (outer.deleted, outer.errors) == (3, 1)
+    assert str(log) == "overall: deleted: 5, errors: 1"
+
+
+def test_cached_api(tmp_path):
+    """Test the disk cache of list results."""
+    from slack_sdk import WebClient
+    from slack_cleaner2 import SlackCleaner
+
+    slack = SlackCleaner(WebClient(token="xoxp-test"), show_progress=False, cache_dir=str(tmp_path))
+    assert slack.cached_api("users", iter([{"id": "U1"}])) == [{"id": "U1"}]
+    # served from the cache without consuming the new entries
+    assert slack.cached_api("users", iter([{"id": "U2"}])) == [{"id": "U1"}]
+
+    # another workspace of the same org wide token has its own cache entries
+    other_team = SlackCleaner(WebClient(token="xoxp-test", team_id="T2"), show_progress=False, cache_dir=str(tmp_path))
+    assert other_team.cached_api("users", iter([{"id": "U3"}])) == [{"id": "U3"}]
+    assert other_team.clear_cache() == 1
+
+    slack.cache_ttl = 0
+    assert slack.cached_api("users", iter([{"id": "U2"}])) == [{"id": "U2"}]
+
+    assert slack.clear_cache() == 1
+    assert not list(tmp_path.iterdir())
+
+
+def test_users_index():
+    """Test the positional access of users including dummy ones."""
+    from slack_sdk import WebClient
+    from slack_cleaner2 import SlackCleaner
+    from slack_cleaner2.model import SlackUser
+
+    slack = SlackCleaner(WebClient(token="xoxp-test"), show_progress=False)
+    users = slack.users
+    # pretend the user list was loaded already
+    users._loaded = True  # pylint: disable=protected-access
+    users._arr = [SlackUser({"id": f"U{i}", "name": f"user{i}", "profile": {"display_name": f"u{i}"}}, slack) for i in range(3)]  # pylint: disable=protected-access
+
+    assert users[-1].id == "U2"
+    assert users[0].id == "U0"
+    assert users[3] is None
+    assert users[-4] is None
+
+    dummy = users.resolve_user("UX")
+    assert users[0] is dummy
+    assert users[-1].id == "U2"
+    assert users[-4] is dummy
+    assert users[-5] is None
+    assert [u.id for u in users] == [users[i].id for i in range(len(users))]
+
+
+def test_download_many_same_name(tmp_path, monkeypatch):
+    """Test that concurrent downloads of equally named files do not share a target."""
+    import io
+    from requests import Response
+    from slack_sdk import WebClient
+    from slack_cleaner2 import SlackCleaner
+    from slack_cleaner2.model import SlackFile
+
+    def download_response(sfile, **kwargs):
+        res = Response()
+        res.raw = io.BytesIO(sfile.id.encode("utf-8"))
+        return res
+
+    monkeypatch.setattr(SlackFile, "download_response", download_response)
+    slack = SlackCleaner(WebClient(token="xoxp-test"), show_progress=False)
+    files = [SlackFile({"id": file_id, "name": "image.png", "user": "U1", "created": 1}, slack) for file_id in ("F1", "F2")]
+
+    paths = SlackFile.download_many(files, str(tmp_path), workers=2)
+    assert len(set(paths)) == 2
+    assert [open(file_name, "rb").read() for file_name in paths] == [b"F1", b"F2"]
+
+
+@pytest.mark.parametrize("asc", [False, True])
+def test_msgs_thread_broadcast_once(asc):
+    """Test that replies broadcast to the channel are yielded once."""
+    from slack_cleaner2 import SlackCleaner
+    from slack_cleaner2.model import SlackChannel, SlackChannelType
+
+    parent = {"type": "message", "ts": "1.0", "text": "parent", "reply_count": 2}
+    reply = {"type": "message", "ts": "1.5", "thread_ts": "1.0", "text": "reply"}
+    broadcast = {"type": "message", "subtype": "thread_broadcast", "ts": "2.0", "thread_ts": "1.0", "text": "broadcast"}
+    other = {"type": "message", "ts": "3.0", "text": "other"}
+    client = FakeClient(
+        {
+            # newest first like slack
+            "conversations.history": lambda **kw: {"ok": True, "messages": [other, broadcast, parent]},
+            "conversations.replies": lambda **kw: {"ok": True, "messages": [parent, reply, broadcast]},
+        }
+    )
+    slack = SlackCleaner(client, show_progress=False)
+    channel = SlackChannel({"id": "C1", "name": "general"}, SlackChannelType.PUBLIC, slack)
+
+    assert sorted(msg.json["ts"] for msg in channel.msgs(asc=asc, with_replies=True)) == ["1.0", "1.5", "2.0", "3.0"]
+
+
+def test_delete_many():
+    """Test concurrent deletes including a rate limited call and a failing one."""
+    from slack_cleaner2 import SlackCleaner
+    from slack_cleaner2.model import SlackChannel, SlackChannelType, SlackMessage
+
+    rate_limited = []
+
+    def chat_delete(ts, **kw):
+        if ts == "1.0" and not rate_limited:
+            rate_limited.append(ts)
+            # header names are not guaranteed to be capitalized
+            return 429, {"retry-after": "0"}, {"ok": False, "error": "ratelimited"}
+        if ts == "2.0":
+            return {"ok": False, "error": "cant_delete_message"}
+        return {"ok": True}
+
+    client = FakeClient({"chat.delete": chat_delete})
+    slack = SlackCleaner(client, show_progress=False)
+    channel = SlackChannel({"id": "C1", "name": "general"}, SlackChannelType.PUBLIC, slack)
+    msgs = [SlackMessage({"type": "message", "ts": ts, "text": ts}, channel, slack) for ts in ("1.0", "2.0", "3.0")]
+
+    errors = slack.delete_many(msgs, workers=2)
+    assert [error.response["error"] for error in errors] == ["cant_delete_message"]
+    assert slack.log.totals() == (2, 1)
+    # the rate limited call is retried
+    assert rate_limited == ["1.0"]
+    assert client.calls.count("chat.delete") == 4
+
+
+def test_prefetch():
+    """Test the background prefetching of an iterator."""
+    import itertools
+    import threading
+    import time
+    from slack_cleaner2.model import _prefetch
+
+    assert list(_prefetch(iter(range(10)), 2)) == list(range(10))
+
+    def failing():
+        yield 1
+        raise ValueError("broken page")
+
+    consumed = []
+    with pytest.raises(ValueError, match="broken page"):
+        for item in _prefetch(failing(), 1):
+            consumed.append(item)
+    assert consumed == [1]
+
+    before = set(threading.enumerate())
+    items = _prefetch(itertools.count(), 1)
+    assert next(items) == 0
+    items.close()
+    # the producer notices the stop within its put timeout
+    deadline = time.monotonic() + 5
+    while set(threading.enumerate()) - before and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not set(threading.enumerate()) - before
+
+
+def test_conversations_single_listing():
+    """Test splitting the combined conversations.list into the channel types and the per type fallback."""
+    from slack_sdk.errors import SlackApiError
+    from slack_cleaner2 import SlackCleaner
+
+    conversations = {
+        "public_channel": [{"id": "C1", "name": "general", "is_channel": True, "is_private": False}],
+        "private_channel": [{"id": "G1", "name": "secret", "is_channel": True, "is_private": True}],
+        # legacy mpims are flagged as private groups, too
+        "mpim": [{"id": "G2", "name": "mpdm-a--b-1", "is_group": True, "is_private": True, "is_mpim": True}],
+        "im": [{"id": "D1", "is_im": True, "user": "U1"}],
+    }
+
+    def conversations_list(types, **kw):
+        return {"ok": True, "channels": [c for t in types.split(",") for c in conversations[t]]}
+
+    alice = {"id": "U1", "name": "alice", "profile": {"display_name": "alice"}}
+
+    def users_list(**kw):
+        return {"ok": True, "members": [alice]}
+
+    def users_info(user, **kw):
+        return {"ok": True, "user": alice}
+
+    def check(slack):
+        assert [c.id for c in slack.channels] == ["C1"]
+        assert [c.id for c in slack.groups] == ["G1"]
+        assert [c.id for c in slack.mpim] == ["G2"]
+        assert [c.id for c in slack.ims] == ["D1"]
+        assert slack.ims.alice.id == "D1"
+
+    client = FakeClient({"conversations.list": conversations_list, "users.list": users_list})
+    check(SlackCleaner(client, show_progress=False).prefetch())
+    assert client.calls.count("conversations.list") == 1
+
+    def missing_im_scope(types, **kw):
+        if "," in types:
+            raise SlackApiError("missing_scope", SlackResponse(client=None, http_verb="POST", api_url="", req_args={}, data={"ok": False, "error": "missing_scope"}, headers={}, status_code=200))
+        return conversations_list(types)
+
+    client = FakeClient({"conversations.list": missing_im_scope, "users.info": users_info})
+    check(SlackCleaner(client, show_progress=False))
+    # the combined call and one per type
+    assert client.calls.count("conversations.list") == 5
+
+
+def test_users_single_lookup():
+    """Test resolving single users by email, id, and name."""
+    from slack_cleaner2 import SlackCleaner
+
+    users = [{"id": f"U{i}", "name": name, "profile": {"display_name": name, "email": f"{name}@example.com"}} for i, name in enumerate(("alice", "bob", "carol"))]
+
+    def users_info(user, **kw):
+        found = [u for u in users if u["id"] == user]
+        return {"ok": True, "user": found[0]} if found else {"ok": False, "error": "user_not_found"}
+
+    def users_lookup_by_email(email, **kw):
+        return {"ok": True, "user": next(u for u in users if u["profile"]["email"] == email)}
+
+    client = FakeClient({"users.info": users_info, "users.lookupByEmail": users_lookup_by_email, "users.list": lambda **kw: {"ok": True, "members": users}})
+    slack = SlackCleaner(client, show_progress=False)
+
+    assert slack.users["bob@example.com"].id == "U1"
+    assert client.calls == ["users.lookupByEmail"]
+    assert slack.users["U0"].name == "alice"
+    assert client.calls[-1] == "users.info"
+
+    assert slack.users["U404"] is None
+    assert len(client.calls) == 3
+    # unknown ids are remembered
+    assert slack.users["U404"] is None
+    assert "U404" not in slack.users
+    assert len(client.calls) == 3
+
+    # names can only be resolved via the full list
+    assert slack.users["carol"].id == "U2"
+    assert client.calls[-1] == "users.list"
+    assert len(client.calls) == 4